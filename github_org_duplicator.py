@@ -7,25 +7,103 @@ Requires: gh CLI authenticated with 2FA
 """
 
 import subprocess
+import base64
+import http.client
 import json
 import os
+import random
+import re
 import shutil
+import stat
 import sys
+import threading
 import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
 
-def run_command(cmd, check=True, capture=True):
-    """Run a shell command and return result."""
+# Default number of repos cloned/pushed at the same time
+DEFAULT_MIGRATION_WORKERS = 8
+
+# Number of conflicting repos compared at the same time
+COMPARE_WORKERS = 8
+
+# Temp clones are thrown away after the push, so skip automatic gc/maintenance
+# and object integrity checks (git passes -c settings on to child processes)
+GIT_TEMP_CONFIG = [
+    '-c', 'gc.auto=0',
+    '-c', 'maintenance.auto=false',
+    '-c', 'transfer.fsckObjects=false',
+    '-c', 'fetch.fsckObjects=false',
+    '-c', 'receive.fsckObjects=false',
+]
+
+# Several git commands run at once, so git must fail on missing credentials
+# instead of prompting on the terminal (which would hang every one of them)
+GIT_NO_PROMPT_ENV = {**os.environ, 'GIT_TERMINAL_PROMPT': '0', 'GCM_INTERACTIVE': 'never'}
+
+# Successful preflight checks are remembered here so quick reruns skip them
+PREFLIGHT_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'github-org-duplicator', 'preflight.json')
+PREFLIGHT_CACHE_TTL = 60 * 60  # seconds
+
+# Matches an LFS filter attribute in .gitattributes
+LFS_RE = re.compile(r'filter\s*=\s*lfs')
+
+# Exponential backoff between retries, in seconds: 5s, 10s, 20s, ... up to 60s
+# (API calls are cheap to repeat, so they start at half a second)
+RETRY_BASE_DELAY = 5
+API_RETRY_BASE_DELAY = 0.5
+MAX_BACKOFF = 60
+
+# GitHub API settings for the in-process HTTP client
+API_HOST = 'api.github.com'
+API_MAX_RETRIES = 3
+API_RETRY_STATUSES = (429, 502, 503, 504)
+API_PAGE_SIZE = 100
+
+_api_token = None
+_api_token_lock = threading.Lock()
+_api_local = threading.local()
+
+# Serializes updates to the completed repo set/file from migration threads
+_completed_lock = threading.Lock()
+
+# Serializes log writes from migration threads
+_log_lock = threading.Lock()
+
+# Set on Ctrl+C so migration threads stop retrying and don't start new steps
+_shutdown = threading.Event()
+
+# Exit codes of a child killed by Ctrl+C (shell convention / Windows STATUS_CONTROL_C_EXIT)
+INTERRUPTED_EXIT_CODES = (130, 0xC000013A)
+
+class CommandError(RuntimeError):
+    """A command exited with a non-zero status."""
+
+    def __init__(self, message, returncode):
+        super().__init__(message)
+        self.returncode = returncode
+
+def decode_output(data):
+    """Decode captured command output, replacing problematic chars with ?."""
+    return (data or b'').decode('utf-8', errors='replace')
+
+def run_command(cmd, check=True, capture=True, env=None):
+    """Run a shell command and return result (stdout/stderr left as bytes)."""
     result = subprocess.run(
         cmd,
         capture_output=capture,
-        text=True,
-        encoding='utf-8',  # ADD THIS
-        errors='replace',  # ADD THIS - replaces problematic chars with ?
+        env=env,
         check=False
     )
     if check and result.returncode != 0:
-        raise RuntimeError(f"Command failed: {' '.join(cmd)}\n{result.stderr.strip()}")
+        raise CommandError(
+            f"Command failed: {' '.join(cmd)}\n{decode_output(result.stderr).strip()}",
+            result.returncode
+        )
     return result
 
 # def run_command(cmd, check=True, capture=True):
@@ -39,13 +117,17 @@ def run_command(cmd, check=True, capture=True):
 #         raise RuntimeError(f"Command failed: {' '.join(cmd)}\n{result.stderr.strip()}")
 #     return result
 
-def log_message(message, log_file):
-    """Print to console and write to log file."""
+def open_log(log_file):
+    """Open a log file for appending for the lifetime of the migration."""
+    return open(log_file, 'a', buffering=1, encoding='utf-8')
+
+def log_message(message, log_fp):
+    """Print to console and write to an open log file."""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     log_entry = f"[{timestamp}] {message}"
-    print(message)
-    with open(log_file, 'a', encoding='utf-8') as f:  # <-- Added encoding='utf-8'
-        f.write(log_entry + '\n')
+    with _log_lock:
+        print(message)
+        log_fp.write(log_entry + '\n')
 
 # def log_message(message, log_file):
 #     """Print to console and write to log file."""
@@ -55,21 +137,183 @@ def log_message(message, log_file):
 #     with open(log_file, 'a') as f:
 #         f.write(log_entry + '\n')
 
+def get_api_token():
+    """Fetch the gh auth token once and reuse it for every API request."""
+    global _api_token
+    with _api_token_lock:
+        if _api_token is None:
+            _api_token = decode_output(run_command(['gh', 'auth', 'token'], check=True).stdout).strip()
+    return _api_token
+
+def get_api_proxy():
+    """Return the parsed HTTPS proxy URL for the GitHub API, honouring NO_PROXY."""
+    proxy = urllib.request.getproxies().get('https')
+    if not proxy or urllib.request.proxy_bypass(API_HOST):
+        return None
+    if '://' not in proxy:
+        proxy = 'http://' + proxy
+    return urllib.parse.urlsplit(proxy)
+
+def get_api_connection():
+    """Return this thread's persistent HTTPS connection to the GitHub API."""
+    conn = getattr(_api_local, 'conn', None)
+    if conn is None:
+        proxy = get_api_proxy()
+        if proxy is None:
+            conn = http.client.HTTPSConnection(API_HOST, timeout=60)
+        else:
+            # Same as gh/requests: CONNECT through the proxy, then TLS to GitHub
+            conn = http.client.HTTPSConnection(proxy.hostname, proxy.port or 80, timeout=60)
+            tunnel_headers = {}
+            if proxy.username:
+                credentials = f"{urllib.parse.unquote(proxy.username)}:{urllib.parse.unquote(proxy.password or '')}"
+                tunnel_headers['Proxy-Authorization'] = 'Basic ' + base64.b64encode(credentials.encode()).decode()
+            conn.set_tunnel(API_HOST, 443, headers=tunnel_headers)
+        _api_local.conn = conn
+    return conn
+
+def api_request(method, path, payload=None):
+    """Call the GitHub API over a reused connection and return the decoded JSON."""
+    headers = {
+        'Authorization': f'Bearer {get_api_token()}',
+        'Accept': 'application/vnd.github+json',
+        'User-Agent': 'github-org-duplicator',
+    }
+    body = None
+    if payload is not None:
+        body = json.dumps(payload).encode('utf-8')
+        headers['Content-Type'] = 'application/json'
+
+    for attempt in range(API_MAX_RETRIES + 1):
+        conn = get_api_connection()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+        except (http.client.HTTPException, OSError):
+            # Drop the broken connection so the next attempt reconnects. The
+            # first retry is immediate: usually GitHub just closed an idle
+            # keep-alive connection.
+            conn.close()
+            _api_local.conn = None
+            if attempt < API_MAX_RETRIES:
+                if attempt > 0:
+                    time.sleep(backoff_delay(attempt - 1, API_RETRY_BASE_DELAY))
+                continue
+            raise
+        # Secondary rate limits come back as 403 with a Retry-After header
+        retry_after = response.getheader('Retry-After')
+        retryable = response.status in API_RETRY_STATUSES or (response.status == 403 and retry_after)
+        if retryable and attempt < API_MAX_RETRIES:
+            if retry_after and retry_after.isdigit():
+                delay = min(int(retry_after), MAX_BACKOFF)
+                print(f"  GitHub API asked to retry after {retry_after}s, waiting {delay}s...")
+                time.sleep(delay)
+            else:
+                time.sleep(backoff_delay(attempt, API_RETRY_BASE_DELAY))
+            continue
+        break
+
+    if response.status >= 400:
+        raise RuntimeError(
+            f"API request failed: {method} {path} ({response.status})\n"
+            f"{data.decode('utf-8', errors='replace').strip()}"
+        )
+    return json.loads(data) if data else None
+
+def backoff_delay(attempt, base=RETRY_BASE_DELAY):
+    """Exponential backoff with jitter for the given (zero-based) retry attempt."""
+    return min(MAX_BACKOFF, base * 2 ** attempt) + random.uniform(0, 1)
+
+def should_retry(error):
+    """Return False if a failed step must not be retried (Ctrl+C or killed by a signal)."""
+    if _shutdown.is_set():
+        return False
+    returncode = getattr(error, 'returncode', None)
+    return returncode is None or (returncode >= 0 and returncode not in INTERRUPTED_EXIT_CODES)
+
+def check_not_interrupted(repo_name):
+    """Stop a migration before its next step once Ctrl+C has been pressed."""
+    if _shutdown.is_set():
+        raise RuntimeError(f"Interrupted by user before finishing {repo_name}")
+
+def _clear_readonly_and_retry(func, path, _exc):
+    """rmtree error handler: git marks object files read-only, which Windows won't delete."""
+    try:
+        os.chmod(path, stat.S_IWRITE)
+        func(path)
+    except OSError:
+        pass
+
+def remove_tree(path):
+    """Delete a directory tree, using 'rm -rf' on POSIX (missing paths are fine)."""
+    if os.name != 'nt':
+        try:
+            # '--' keeps a temp dir that starts with '-' from being read as options
+            if run_command(['rm', '-rf', '--', path], check=False).returncode == 0:
+                return
+        except OSError:
+            pass
+    # Windows (and the POSIX fallback) delete in Python; no cmd.exe, so no
+    # shell metacharacter parsing of the path
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(path, onexc=_clear_readonly_and_retry)
+    else:
+        shutil.rmtree(path, onerror=_clear_readonly_and_retry)
+
+def load_preflight_cache():
+    """Load the preflight checks that passed within the last PREFLIGHT_CACHE_TTL."""
+    try:
+        with open(PREFLIGHT_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    now = time.time()
+    return {
+        check: passed_at for check, passed_at in cache.items()
+        if isinstance(passed_at, (int, float)) and now - passed_at < PREFLIGHT_CACHE_TTL
+    }
+
+def preflight_passed_recently(check):
+    """Return True if a preflight check passed recently enough to skip it."""
+    return check in load_preflight_cache()
+
+def record_preflight(check):
+    """Remember that a preflight check passed (best effort)."""
+    cache = load_preflight_cache()
+    cache[check] = time.time()
+    try:
+        os.makedirs(os.path.dirname(PREFLIGHT_CACHE_FILE), exist_ok=True)
+        with open(PREFLIGHT_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+    except OSError:
+        pass
+
+@lru_cache(maxsize=None)
 def check_gh_installed():
     """Verify gh CLI is installed."""
+    if preflight_passed_recently('gh_installed'):
+        print("✓ gh CLI installed (checked recently)")
+        return
     try:
         run_command(['gh', '--version'], check=True)
         print("✓ gh CLI installed")
+        record_preflight('gh_installed')
     except:
         print("ERROR: gh CLI is not installed.")
         print("Install from: https://cli.github.com/")
         sys.exit(1)
 
+@lru_cache(maxsize=None)
 def check_gh_authenticated():
     """Verify gh is authenticated."""
+    if preflight_passed_recently('gh_authenticated'):
+        print("✓ gh authenticated (checked recently)")
+        return
     try:
         run_command(['gh', 'auth', 'status'], check=True)
         print("✓ gh authenticated")
+        record_preflight('gh_authenticated')
     except:
         print("ERROR: gh is not authenticated.")
         print("Run: gh auth login")
@@ -84,131 +328,120 @@ def setup_git_credentials():
         print("WARNING: Could not configure git to use gh credentials")
         print("You may need to run: gh auth setup-git")
 
+@lru_cache(maxsize=None)
 def check_org_access(org):
-    """Verify access to an organization."""
+    """Verify access to an organization (or user account, like gh repo list)."""
+    if preflight_passed_recently(f'org_access:{org}'):
+        return True
     try:
-        run_command(['gh', 'repo', 'list', org, '--limit', '1', '--json', 'name'], check=True)
+        api_request('GET', f'/users/{org}')
+        record_preflight(f'org_access:{org}')
         return True
     except:
         print(f"ERROR: Cannot access organization '{org}'")
         print(f"Make sure you have access and the org name is correct.")
         sys.exit(1)
 
-def check_repo_for_lfs(org, repo_name):
-    """Check if a repository uses Git LFS by looking for .gitattributes with LFS filters."""
-    try:
-        # Fetch .gitattributes file content
-        result = run_command([
-            'gh', 'api',
-            f'/repos/{org}/{repo_name}/contents/.gitattributes',
-            '--jq', '.content'
-        ], check=False)
-        
-        if result.returncode == 0:
-            # Decode base64 content
-            import base64
-            content = base64.b64decode(result.stdout.strip()).decode('utf-8', errors='ignore')
-            if 'filter=lfs' in content:
-                return True
-    except:
-        pass
-    return False
+REPOS_QUERY = """
+query($org: String!, $cursor: String) {
+  repositoryOwner(login: $org) {
+    repositories(first: %d, after: $cursor, ownerAffiliations: OWNER) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        createdAt
+        isPrivate
+        description
+        diskUsage
+        object(expression: "HEAD:.gitattributes") { ... on Blob { text } }
+      }
+    }
+  }
+}
+""" % API_PAGE_SIZE
+
+def fetch_all_repos_graphql(org):
+    """Fetch every repo owned by an org (or user), including its .gitattributes, page by page."""
+    repos = []
+    cursor = None
+    while True:
+        response = api_request('POST', '/graphql', {
+            'query': REPOS_QUERY,
+            'variables': {'org': org, 'cursor': cursor},
+        })
+        owner = (response.get('data') or {}).get('repositoryOwner')
+        if owner is None:
+            errors = '; '.join(e.get('message', '') for e in response.get('errors', []))
+            raise RuntimeError(f"GraphQL query for {org} failed: {errors or 'owner not found'}")
+        page = owner['repositories']
+        repos.extend(page['nodes'])
+        print(f"  {org}: fetched {len(repos)} repos")
+        if not page['pageInfo']['hasNextPage']:
+            break
+        cursor = page['pageInfo']['endCursor']
+    return repos
 
 def get_repos_with_details(org):
     """Fetch all repos from an organization with detailed information."""
     print(f"Fetching repos from {org}...")
     try:
-        result = run_command([
-            'gh', 'repo', 'list', org,
-            '--limit', '1000',
-            '--json', 'name,createdAt,isPrivate,description,diskUsage'
-        ])
+        repos = fetch_all_repos_graphql(org)
     except Exception as e:
         print(f"ERROR: Failed to fetch repos from {org}")
         print(str(e))
         sys.exit(1)
     
-    repos = json.loads(result.stdout)
-
-    # Check each repo for LFS
-    print(f"Checking {len(repos)} repos for Git LFS usage...")
-    for idx, repo in enumerate(repos, 1):
-        # Clear line and print progress
-        print(f"\r{' ' * 80}\r  Checking {idx}/{len(repos)}: {repo['name']}", end='', flush=True)
-        repo['uses_lfs'] = check_repo_for_lfs(org, repo['name'])
-    print()  # New line after progress
-
-    # # Check each repo for LFS
-    # print(f"Checking {len(repos)} repos for Git LFS usage...")
-    # for idx, repo in enumerate(repos, 1):
-    #     print(f"  Checking {idx}/{len(repos)}: {repo['name']}", end='\r')
-    #     repo['uses_lfs'] = check_repo_for_lfs(org, repo['name'])
-    # print()  # New line after progress
+    # LFS usage comes from the .gitattributes blob fetched with each repo.
+    # Repos without one (or empty repos) come back with a null object, so
+    # they are ruled out without any extra lookup or scan.
+    for repo in repos:
+        blob_text = (repo.pop('object', None) or {}).get('text')
+        repo['uses_lfs'] = bool(blob_text) and LFS_RE.search(blob_text) is not None
+        repo['diskUsage'] = repo.get('diskUsage') or 0
     
+    # Sort by creation date (oldest first) once; display and migration rely on it
+    repos.sort(key=itemgetter('createdAt'))
     return repos
 
+def list_remote_refs(org, repo_name):
+    """Return {ref: sha} for every ref in a GitHub repo using a single git ls-remote."""
+    url = f"https://github.com/{org}/{repo_name}.git"
+    result = run_command(['git', 'ls-remote', '--symref', url], check=True, env=GIT_NO_PROMPT_ENV)
+    refs = {}
+    for line in decode_output(result.stdout).splitlines():
+        if not line.strip():
+            continue
+        sha, ref = line.split('\t', 1)
+        # Pull request refs are read-only on GitHub and are never migrated
+        if ref.startswith('refs/pull/'):
+            continue
+        # '--symref' reports HEAD as "ref: refs/heads/<default>\tHEAD"; keep
+        # that so a different default branch counts as a mismatch
+        if ref == 'HEAD' and 'HEAD' in refs:
+            continue
+        refs[ref] = sha
+    return refs
+
 def compare_repos(source_org, dest_org, repo_name):
     """Compare two repos to see if they're identical duplicates."""
     try:
-        # Get default branch info from both repos
-        source_info = run_command([
-            'gh', 'api', f'/repos/{source_org}/{repo_name}',
-            '--jq', '{default_branch: .default_branch, size: .size}'
-        ], check=True)
-        
-        dest_info = run_command([
-            'gh', 'api', f'/repos/{dest_org}/{repo_name}',
-            '--jq', '{default_branch: .default_branch, size: .size}'
-        ], check=True)
-        
-        source_data = json.loads(source_info.stdout.strip())
-        dest_data = json.loads(dest_info.stdout.strip())
-        
-        # Check if default branches match
-        if source_data['default_branch'] != dest_data['default_branch']:
-            return False, "Default branches don't match"
-        
-        # Get branch info from both repos
-        source_branches = run_command([
-            'gh', 'api', f'/repos/{source_org}/{repo_name}/branches',
-            '--jq', '.[].name'
-        ], check=True)
-        
-        dest_branches = run_command([
-            'gh', 'api', f'/repos/{dest_org}/{repo_name}/branches',
-            '--jq', '.[].name'
-        ], check=True)
-        
-        source_branch_list = set(source_branches.stdout.strip().split('\n')) if source_branches.stdout.strip() else set()
-        dest_branch_list = set(dest_branches.stdout.strip().split('\n')) if dest_branches.stdout.strip() else set()
-        
-        # If dest has no branches at all, it's empty
-        if not dest_branch_list and source_branch_list:
+        # Fetch every ref from both repos at the same time
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            source_future = executor.submit(list_remote_refs, source_org, repo_name)
+            dest_future = executor.submit(list_remote_refs, dest_org, repo_name)
+            source_refs = source_future.result()
+            dest_refs = dest_future.result()
+        
+        # If dest has no refs at all, it's empty
+        if not dest_refs and source_refs:
             return False, "Destination repo has no branches"
         
-        # Compare branch names
-        if source_branch_list != dest_branch_list:
-            return False, f"Branch count mismatch (source: {len(source_branch_list)}, dest: {len(dest_branch_list)})"
-        
-        # For each branch, compare the HEAD commit SHA
-        all_match = True
-        for branch in source_branch_list:
-            source_sha = run_command([
-                'gh', 'api', f'/repos/{source_org}/{repo_name}/branches/{branch}',
-                '--jq', '.commit.sha'
-            ], check=True).stdout.strip()
-            
-            dest_sha = run_command([
-                'gh', 'api', f'/repos/{dest_org}/{repo_name}/branches/{branch}',
-                '--jq', '.commit.sha'
-            ], check=True).stdout.strip()
-            
-            if source_sha != dest_sha:
-                return False, f"Branch '{branch}' has different HEAD commits"
+        # Compare every branch, tag and the default branch (HEAD symref)
+        for ref in sorted(source_refs.keys() | dest_refs.keys()):
+            if source_refs.get(ref) != dest_refs.get(ref):
+                return False, f"ref {ref} differs"
         
-        # If all branches match, repos are identical regardless of reported size
-        # (GitHub's size calculation can be delayed)
-        return True, "Repos are identical (all branches match)"
+        return True, "Repos are identical (all refs match)"
         
     except Exception as e:
         return False, f"Error comparing: {str(e)}"
@@ -344,16 +577,16 @@ def display_repo_table(repos, org_name):
         print("No repositories found.")
         return
     
-    # Sort by creation date (oldest first)
-    sorted_repos = sorted(repos, key=lambda r: r['createdAt'])
-    
     # Table header
     print(f"{'#':<4} {'Name':<40} {'Size':<12} {'Private':<8} {'LFS':<6} {'Created':<20}")
     print("-" * 100)
     
+    # Repos arrive sorted by creation date from get_repos_with_details
     lfs_repos = []
-    for idx, repo in enumerate(sorted_repos, 1):
-        name = repo['name'][:39] if len(repo['name']) > 39 else repo['name']
+    total_size = 0
+    for idx, repo in enumerate(repos, 1):
+        name = repo['name'][:39]
+        total_size += repo.get('diskUsage', 0)
         size = format_size(repo.get('diskUsage', 0))
         private = "Yes" if repo['isPrivate'] else "No"
         lfs = "⚠ YES" if repo['uses_lfs'] else "No"
@@ -365,8 +598,8 @@ def display_repo_table(repos, org_name):
             lfs_repos.append(repo['name'])
     
     print("=" * 100)
-    print(f"Total: {len(sorted_repos)} repositories")
-    print(f"Total size: {format_size(sum(r.get('diskUsage', 0) for r in sorted_repos))}")
+    print(f"Total: {len(repos)} repositories")
+    print(f"Total size: {format_size(total_size)}")
     
     if lfs_repos:
         print()
@@ -376,11 +609,151 @@ def display_repo_table(repos, org_name):
         print()
         print("Git LFS repositories require special handling:")
         print("  1. You must have Git LFS installed (git lfs install)")
-        print("  2. LFS files may not transfer correctly with --mirror")
-        print("  3. You may need to manually configure LFS in the new org")
+        print("  2. LFS objects are copied separately with git lfs fetch/push")
+        print("  3. LFS storage and bandwidth count against the new org's quota")
     
     print()
 
+def migrate_one(repo, source_org, dest_org, temp_dir, completed_repos, completed_fp, logs):
+    """Clone, create, push and clean up a single repo. Returns True on success."""
+    repo_name = repo['name']
+    is_private = repo['isPrivate']
+    description = repo.get('description', '') or ''
+    uses_lfs = repo.get('uses_lfs', False)
+    repo_size = format_size(repo.get('diskUsage', 0))
+    
+    print(f"Processing: {repo_name} [{repo_size}]")
+    if uses_lfs:
+        print(f"  ⚠ [{repo_name}] This repo uses Git LFS")
+    
+    repo_temp_path = os.path.join(temp_dir, repo_name)
+    start_time = time.time()
+    
+    try:
+        # Step 1: Clone from source org
+        check_not_interrupted(repo_name)
+        print(f"  → [{repo_name}] Cloning from {source_org}...")
+
+        # Clean up any leftover temp directory first
+        if os.path.exists(repo_temp_path):
+            print(f"  → [{repo_name}] Cleaning up leftover temp directory...")
+            remove_tree(repo_temp_path)
+
+        clone_url = f"https://github.com/{source_org}/{repo_name}.git"
+        
+        # Retry logic for clone
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                run_command(
+                    ['git', *GIT_TEMP_CONFIG, 'clone', '--mirror', clone_url, repo_temp_path],
+                    check=True, env=GIT_NO_PROMPT_ENV
+                )
+                break
+            except Exception as e:
+                if attempt < max_retries - 1 and should_retry(e):
+                    delay = backoff_delay(attempt)
+                    print(f"  → [{repo_name}] Clone attempt {attempt + 1} failed, retrying in {delay:.0f}s...")
+                    if _shutdown.wait(delay):
+                        raise
+                else:
+                    raise
+        
+        # Step 2: Create repo in dest org (never after Ctrl+C, so an
+        # interrupted run can't leave an empty repo behind in the dest org)
+        check_not_interrupted(repo_name)
+        print(f"  → [{repo_name}] Creating in {dest_org}...")
+        visibility = "--private" if is_private else "--public"
+        cmd = ['gh', 'repo', 'create', f"{dest_org}/{repo_name}", visibility, '--clone=false']
+        
+        # Handle description with potential quotes
+        if description:
+            safe_description = description.replace('"', "'")
+            cmd.extend(['--description', safe_description])
+        
+        run_command(cmd, check=True)
+        
+        push_url = f"https://github.com/{dest_org}/{repo_name}.git"
+        
+        # List the refs to migrate once, leaving out pull request refs
+        result = run_command(
+            ['git', '-C', repo_temp_path, 'for-each-ref', '--format=%(refname)', 'refs/'],
+            check=True
+        )
+        all_refs = decode_output(result.stdout).split('\n')
+        good_refs = [ref for ref in all_refs if ref and not ref.startswith('refs/pull/')]
+        
+        # Step 3: Copy LFS objects, which a mirror clone doesn't include.
+        # Only objects reachable from good_refs are copied, so pull request
+        # (and fork) LFS content isn't fetched or uploaded.
+        if uses_lfs and good_refs:
+            print(f"  → [{repo_name}] Copying Git LFS objects...")
+            for attempt in range(max_retries):
+                try:
+                    run_command(
+                        ['git', *GIT_TEMP_CONFIG, '-C', repo_temp_path, 'lfs', 'fetch', '--all', 'origin']
+                        + good_refs,
+                        check=True, env=GIT_NO_PROMPT_ENV
+                    )
+                    run_command(
+                        ['git', *GIT_TEMP_CONFIG, '-C', repo_temp_path, 'lfs', 'push', '--all', push_url]
+                        + good_refs,
+                        check=True, env=GIT_NO_PROMPT_ENV
+                    )
+                    break
+                except Exception as e:
+                    if attempt < max_retries - 1 and should_retry(e):
+                        delay = backoff_delay(attempt)
+                        print(f"  → [{repo_name}] LFS attempt {attempt + 1} failed, retrying in {delay:.0f}s...")
+                        if _shutdown.wait(delay):
+                            raise
+                    else:
+                        raise
+        
+        # Step 4: Push to dest org (excluding pull request refs)
+        check_not_interrupted(repo_name)
+        print(f"  → [{repo_name}] Pushing to {dest_org}...")
+
+        # Retry logic for push
+        for attempt in range(max_retries):
+            try:
+                # Push only the good refs
+                if good_refs:
+                    run_command(
+                        ['git', *GIT_TEMP_CONFIG, '-C', repo_temp_path, 'push', push_url] + good_refs,
+                        check=True, env=GIT_NO_PROMPT_ENV
+                    )
+                break
+            except Exception as e:
+                if attempt < max_retries - 1 and should_retry(e):
+                    delay = backoff_delay(attempt)
+                    print(f"  → [{repo_name}] Push attempt {attempt + 1} failed, retrying in {delay:.0f}s...")
+                    if _shutdown.wait(delay):
+                        raise
+                else:
+                    raise
+        
+        # Step 5: Clean up temp directory
+        print(f"  → [{repo_name}] Cleaning up...")
+        remove_tree(repo_temp_path)
+        
+        # Step 6: Mark as complete
+        mark_completed(repo_name, completed_repos, completed_fp)
+        
+        elapsed = time.time() - start_time
+        success_msg = f"✓ {repo_name} complete (took {elapsed:.1f}s)"
+        log_message(success_msg, logs['success'])
+        return True
+        
+    except Exception as e:
+        # Clean up on failure
+        remove_tree(repo_temp_path)
+        
+        elapsed = time.time() - start_time
+        error_msg = f"✗ {repo_name} FAILED after {elapsed:.1f}s: {str(e)}"
+        log_message(error_msg, logs['error'])
+        return False
+
 def main():
     print("=" * 60)
     print("GitHub Organization Repository Migration")
@@ -409,8 +782,11 @@ def main():
     
     # Detect repos in both orgs
     print("Detecting repos in both orgs...")
-    source_repos = get_repos_with_details(source_org)
-    dest_repos = get_repos_with_details(dest_org)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        source_future = executor.submit(get_repos_with_details, source_org)
+        dest_future = executor.submit(get_repos_with_details, dest_org)
+        source_repos = source_future.result()
+        dest_repos = dest_future.result()
     
     print(f"✓ {len(source_repos)} repos found in {source_org}")
     print(f"✓ {len(dest_repos)} repos found in {dest_org}")
@@ -420,11 +796,11 @@ def main():
     completed_file = 'completed_repos.txt'
     error_log = 'migration_errors.txt'
     success_log = 'migration_log.txt'
+    completed_repos = load_completed_repos(completed_file)
 
     # Check for conflicts (case-insensitive)
-    source_names = {repo['name'].lower(): repo['name'] for repo in source_repos}
-    dest_names = {repo['name'].lower(): repo['name'] for repo in dest_repos}
-    conflicts = set(source_names.keys()) & set(dest_names.keys())
+    source_by_lower = {repo['name'].lower(): repo for repo in source_repos}
+    conflicts = source_by_lower.keys() & {repo['name'].lower() for repo in dest_repos}
 
     if conflicts:
         print()
@@ -435,18 +811,22 @@ def main():
         actual_conflicts = []
         verified_duplicates = []
         
-        for name_lower in sorted(conflicts):
-            repo_name = source_names[name_lower]
-            print(f"Checking: {repo_name}...", end=' ')
-            
-            is_identical, reason = compare_repos(source_org, dest_org, repo_name)
-            
-            if is_identical:
-                print(f"✓ Verified duplicate")
-                verified_duplicates.append(repo_name)
-            else:
-                print(f"✗ Different ({reason})")
-                actual_conflicts.append(repo_name)
+        # Compare concurrently, reporting results in name order
+        conflict_names = [source_by_lower[name_lower]['name'] for name_lower in sorted(conflicts)]
+        with ThreadPoolExecutor(max_workers=COMPARE_WORKERS) as executor:
+            results = executor.map(
+                lambda repo_name: compare_repos(source_org, dest_org, repo_name),
+                conflict_names
+            )
+            for repo_name, (is_identical, reason) in zip(conflict_names, results):
+                print(f"Checking: {repo_name}...", end=' ')
+                
+                if is_identical:
+                    print(f"✓ Verified duplicate")
+                    verified_duplicates.append(repo_name)
+                else:
+                    print(f"✗ Different ({reason})")
+                    actual_conflicts.append(repo_name)
         
         print()
         
@@ -463,10 +843,9 @@ def main():
             print(f"✓ All {len(verified_duplicates)} matching repos are verified duplicates")
             print("These will be skipped during migration.")
             # Add verified duplicates to completed list
-            for repo_name in verified_duplicates:
-                if repo_name not in load_completed_repos(completed_file):
-                    with open(completed_file, 'a') as f:
-                        f.write(f"{repo_name}\n")
+            with open(completed_file, 'a', buffering=1) as completed_fp:
+                for repo_name in verified_duplicates:
+                    mark_completed(repo_name, completed_repos, completed_fp)
             print()
     else:
         print("✓ No conflicts!")
@@ -512,10 +891,19 @@ def main():
         print(f"ERROR: {temp_dir} is not a directory")
         sys.exit(1)
     
+    # Get number of repos to migrate at once
+    workers = input(f"Parallel migrations [{DEFAULT_MIGRATION_WORKERS}]: ").strip()
+    if not workers:
+        workers = DEFAULT_MIGRATION_WORKERS
+    elif workers.isdigit() and int(workers) > 0:
+        workers = int(workers)
+    else:
+        print(f"ERROR: {workers} is not a positive number")
+        sys.exit(1)
+    
     print()
     
-    # Load completed repos
-    completed_repos = load_completed_repos(completed_file)
+    # Skip completed repos (source_repos is already sorted oldest first)
     remaining_repos = [r for r in source_repos if r['name'] not in completed_repos]
     
     if completed_repos:
@@ -526,6 +914,13 @@ def main():
     
     print()
     
+    # LFS repos need git-lfs to copy their large files
+    if any(r.get('uses_lfs') for r in remaining_repos):
+        if run_command(['git', 'lfs', 'version'], check=False).returncode != 0:
+            print("WARNING: Some repos use Git LFS but git-lfs is not installed.")
+            print("Those repos will fail until you install it (git lfs install).")
+            print()
+    
     # Confirm before proceeding
     confirmation = input('Type "YES" to continue: ').strip()
     if confirmation != "YES":
@@ -538,148 +933,40 @@ def main():
     print("=" * 60)
     print()
     
-    # Sort by creation date (oldest first)
-    remaining_repos.sort(key=lambda r: r['createdAt'])
-    
     # Statistics
     total_repos = len(remaining_repos)
     successful = 0
     failed = 0
     
-    # Main loop
-    for idx, repo in enumerate(remaining_repos, 1):
-        repo_name = repo['name']
-        is_private = repo['isPrivate']
-        description = repo.get('description', '') or ''
-        uses_lfs = repo.get('uses_lfs', False)
-        repo_size = format_size(repo.get('diskUsage', 0))
-        
-        print(f"[{idx}/{total_repos}] Processing: {repo_name} [{repo_size}]")
-        if uses_lfs:
-            print(f"  ⚠ This repo uses Git LFS")
-        
-        repo_temp_path = os.path.join(temp_dir, repo_name)
-        start_time = time.time()
-        
+    # Main loop (network bound, so several repos are migrated at once)
+    print(f"Migrating {total_repos} repos, {workers} at a time...")
+    print()
+    with open(completed_file, 'a', buffering=1) as completed_fp, \
+            open_log(success_log) as success_fp, \
+            open_log(error_log) as error_fp, \
+            ThreadPoolExecutor(max_workers=workers) as executor:
+        logs = {'success': success_fp, 'error': error_fp}
+        # Submitted oldest first, so repos still start in creation order
+        futures = {
+            executor.submit(migrate_one, repo, source_org, dest_org, temp_dir,
+                            completed_repos, completed_fp, logs): repo
+            for repo in remaining_repos
+        }
         try:
-            # Step 1: Clone from source org
-            print(f"  → Cloning from {source_org}...")
-
-            # Clean up any leftover temp directory first
-            if os.path.exists(repo_temp_path):
-                print(f"  → Cleaning up leftover temp directory...")
-                shutil.rmtree(repo_temp_path, ignore_errors=True)
-
-            clone_url = f"https://github.com/{source_org}/{repo_name}.git"
-
-            # # Step 1: Clone from source org
-            # print(f"  → Cloning from {source_org}...")
-            # clone_url = f"https://github.com/{source_org}/{repo_name}.git"
-            
-            # Retry logic for clone
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    run_command(
-                        ['git', 'clone', '--mirror', clone_url, repo_temp_path],
-                        check=True
-                    )
-                    break
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        print(f"  → Clone attempt {attempt + 1} failed, retrying...")
-                        time.sleep(5)
-                    else:
-                        raise
-            
-            # Step 2: Create repo in dest org
-            print(f"  → Creating in {dest_org}...")
-            visibility = "--private" if is_private else "--public"
-            cmd = ['gh', 'repo', 'create', f"{dest_org}/{repo_name}", visibility, '--clone=false']
-            
-            # Handle description with potential quotes
-            if description:
-                safe_description = description.replace('"', "'")
-                cmd.extend(['--description', safe_description])
-            
-            run_command(cmd, check=True)
-            
-            # Step 3: Push to dest org (excluding pull request refs)
-            print(f"  → Pushing to {dest_org}...")
-            push_url = f"https://github.com/{dest_org}/{repo_name}.git"
-
-            # Retry logic for push
-            for attempt in range(max_retries):
-                try:
-                    # First, get list of all refs
-                    result = run_command(
-                        ['git', '-C', repo_temp_path, 'for-each-ref', '--format=%(refname)', 'refs/'],
-                        check=True
-                    )
-                    
-                    # Filter out pull request refs
-                    all_refs = result.stdout.strip().split('\n')
-                    good_refs = [ref for ref in all_refs if not ref.startswith('refs/pull/')]
-                    
-                    # Push only the good refs
-                    if good_refs:
-                        run_command(
-                            ['git', '-C', repo_temp_path, 'push', push_url] + good_refs,
-                            check=True
-                        )
-                    break
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        print(f"  → Push attempt {attempt + 1} failed, retrying...")
-                        time.sleep(5)
-                    else:
-                        raise
-
-            # # Step 3: Push to dest org
-            # print(f"  → Pushing to {dest_org}...")
-            # push_url = f"https://github.com/{dest_org}/{repo_name}.git"
-            
-            # # Retry logic for push
-            # for attempt in range(max_retries):
-            #     try:
-            #         run_command(
-            #             ['git', '-C', repo_temp_path, 'push', '--mirror', push_url],
-            #             check=True
-            #         )
-            #         break
-            #     except Exception as e:
-            #         if attempt < max_retries - 1:
-            #             print(f"  → Push attempt {attempt + 1} failed, retrying...")
-            #             time.sleep(5)
-            #         else:
-            #             raise
-            
-            # Step 4: Clean up temp directory
-            print(f"  → Cleaning up...")
-            if os.path.exists(repo_temp_path):
-                shutil.rmtree(repo_temp_path, ignore_errors=True)
-            
-            # Step 5: Mark as complete
-            with open(completed_file, 'a') as f:
-                f.write(f"{repo_name}\n")
-            
-            elapsed = time.time() - start_time
-            success_msg = f"✓ {repo_name} complete (took {elapsed:.1f}s)"
-            log_message(success_msg, success_log)
-            print()
-            successful += 1
-            
-        except Exception as e:
-            # Clean up on failure
-            if os.path.exists(repo_temp_path):
-                shutil.rmtree(repo_temp_path, ignore_errors=True)
-            
-            elapsed = time.time() - start_time
-            error_msg = f"✗ {repo_name} FAILED after {elapsed:.1f}s: {str(e)}"
-            log_message(error_msg, error_log)
-            print()
-            failed += 1
-            continue
+            for idx, future in enumerate(as_completed(futures), 1):
+                if future.result():
+                    successful += 1
+                else:
+                    failed += 1
+                print(f"[{idx}/{total_repos}] Finished: {futures[future]['name']} "
+                      f"({successful} succeeded, {failed} failed)")
+        except KeyboardInterrupt:
+            # Stop retries/new steps in running repos and drop queued ones. The
+            # with block still waits for the running repos, which now fail fast,
+            # so their log and completed-file writes aren't cut off.
+            _shutdown.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
     
     # Final summary
     print("=" * 60)
@@ -695,6 +982,13 @@ def main():
     print(f"\nCompleted repos logged in: {completed_file}")
     print(f"Success log: {success_log}")
 
+def mark_completed(repo_name, completed_repos, completed_fp):
+    """Record a repo as migrated, both in memory and in the completed file."""
+    with _completed_lock:
+        if repo_name not in completed_repos:
+            completed_fp.write(f"{repo_name}\n")
+            completed_repos.add(repo_name)
+
 def load_completed_repos(filename):
     """Load list of completed repos from file."""
     if not os.path.exists(filename):